@@ -13,6 +13,7 @@ import inspect
 import json
 import os
 import re
+import selectors
 import sys
 import threading
 import time
@@ -31,6 +32,13 @@ def _safe_id(value: str) -> str:
 
 _PILOTY_DIR = Path.home() / ".piloty"
 
+# Bytes requested per PTY read. Larger reads cut per-chunk overhead
+# (capture, VT100 feed, transcript write) for high-throughput output.
+_READ_SIZE = 8192
+
+# Characters str.splitlines() treats as line boundaries.
+_LINE_BOUNDARIES = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
 _SERVER_INSTANCE_ID = _safe_id(
     os.getenv("PILOTY_SERVER_INSTANCE_ID")
     or f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}_{os.getpid()}"
@@ -86,28 +94,36 @@ class _PyteListenerProxy:
         return wrapper
 
 
-def _path_without_entry(path_value: str, entry: str) -> str:
+_STRIP_ENV = frozenset(
+    (
+        "VIRTUAL_ENV",
+        "VIRTUAL_ENV_PROMPT",
+        "PYTHONHOME",
+        "PYTHONPATH",
+        "__PYVENV_LAUNCHER__",
+    )
+)
+
+
+def _path_without_entries(path_value: str, entries: set[str]) -> str:
     if not path_value:
         return ""
-    normalized_entry = os.path.normcase(os.path.abspath(entry))
-    kept: list[str] = []
-    for part in path_value.split(os.pathsep):
-        if not part:
-            continue
-        normalized_part = os.path.normcase(os.path.abspath(part))
-        if normalized_part == normalized_entry:
-            continue
-        kept.append(part)
-    return os.pathsep.join(kept)
+    if not entries:
+        return path_value
+    normalized_entries = {os.path.normcase(os.path.abspath(e)) for e in entries}
+    return os.pathsep.join(
+        part
+        for part in path_value.split(os.pathsep)
+        if part and os.path.normcase(os.path.abspath(part)) not in normalized_entries
+    )
 
 
 def _session_env(rows: int, cols: int) -> dict[str, str]:
-    env = dict(os.environ)
-    leaked_virtual_env = env.pop("VIRTUAL_ENV", None)
-    env.pop("VIRTUAL_ENV_PROMPT", None)
-    env.pop("PYTHONHOME", None)
-    env.pop("PYTHONPATH", None)
-    env.pop("__PYVENV_LAUNCHER__", None)
+    # Keep this str-keyed: pexpect resolves the shell via env.get("PATH") before
+    # exec, so an os.environb-based bytes mapping would silently fall back to
+    # os.defpath.
+    leaked_virtual_env = os.environ.get("VIRTUAL_ENV")
+    env = {k: v for k, v in os.environ.items() if k not in _STRIP_ENV}
 
     leaked_bins: set[str] = set()
     if leaked_virtual_env:
@@ -117,10 +133,7 @@ def _session_env(rows: int, cols: int) -> dict[str, str]:
     if (Path(exe_bin).parent / "pyvenv.cfg").exists():
         leaked_bins.add(exe_bin)
 
-    path_value = env.get("PATH", "")
-    for leaked_bin in leaked_bins:
-        path_value = _path_without_entry(path_value, leaked_bin)
-    env["PATH"] = path_value
+    env["PATH"] = _path_without_entries(env.get("PATH", ""), leaked_bins)
 
     env["TERM"] = "xterm-256color"
     env["LINES"] = str(rows)
@@ -201,6 +214,10 @@ class PTY:
             cwd=cwd,
             dimensions=(rows, cols),
         )
+        # Register the PTY master once and block on it between reads, instead of
+        # setting up a fresh select() inside every timed read_nonblocking() call.
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._process.child_fd, selectors.EVENT_READ)
 
         self._drain(quiescence_ms=self._quiescence_ms, timeout=2.0, log=True, capture=False)
         self._write_session_meta()
@@ -356,7 +373,9 @@ class PTY:
                     return {"status": "timeout", "output": out, **self._capture_stats(), "match": None, "groups": []}
 
                 try:
-                    chunk = self._process.read_nonblocking(size=4096, timeout=min(0.1, deadline - now))
+                    if not self._wait_readable(min(0.1, deadline - now)) and self._process.isalive():
+                        continue
+                    chunk = self._process.read_nonblocking(size=_READ_SIZE, timeout=0)
                     if chunk:
                         self._last_output_time = time.monotonic()
                         buf += chunk
@@ -544,6 +563,10 @@ class PTY:
         with self._lock:
             if self._process.isalive():
                 self._process.terminate(force=True)
+            try:
+                self._selector.close()
+            except Exception:
+                pass
             try:
                 self._transcript_file.close()
             except Exception:
@@ -578,7 +601,7 @@ class PTY:
             # been idle long enough to be "quiescent", we could return without
             # noticing unread output that arrived since the last drain call.
             try:
-                chunk = self._process.read_nonblocking(size=4096, timeout=0)
+                chunk = self._process.read_nonblocking(size=_READ_SIZE, timeout=0)
                 if chunk:
                     self._last_output_time = time.monotonic()
                     saw_output = True
@@ -617,7 +640,10 @@ class PTY:
                 read_timeout = min(time_until_quiescent, time_until_deadline, 0.1)
 
             try:
-                chunk = self._process.read_nonblocking(size=4096, timeout=read_timeout)
+                # Liveness is checked by the immediate read at the top of the loop.
+                if not self._wait_readable(read_timeout):
+                    continue
+                chunk = self._process.read_nonblocking(size=_READ_SIZE, timeout=0)
                 if chunk:
                     self._last_output_time = time.monotonic()
                     saw_output = True
@@ -643,10 +669,20 @@ class PTY:
                 self._fatal_error = f"{type(e).__name__}: {e}"
                 return "error"
 
+    def _wait_readable(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for the PTY master to become readable."""
+        if timeout <= 0:
+            return True
+        try:
+            return bool(self._selector.select(timeout))
+        except Exception:
+            # Closed selector or unexpected fd state: let the read surface it.
+            return True
+
     def _drain_available(self, *, log: bool = True, capture: bool = False):
         while True:
             try:
-                chunk = self._process.read_nonblocking(size=4096, timeout=0)
+                chunk = self._process.read_nonblocking(size=_READ_SIZE, timeout=0)
                 if not chunk:
                     return
                 self._last_output_time = time.monotonic()
@@ -682,14 +718,20 @@ class PTY:
 
     def _capture_chunk(self, chunk: str):
         self._capture_total_bytes += len(chunk)
-        self._line_buf += chunk
-        parts = self._line_buf.splitlines(True)
-        if parts and not parts[-1].endswith(("\n", "\r")):
-            self._line_buf = parts.pop()
-        else:
-            self._line_buf = ""
+        # Split only the new chunk. Re-splitting the accumulated partial line on
+        # every read is quadratic when a long line arrives in many chunks.
+        parts = chunk.splitlines(True)
+        if not parts:
+            return
+        # Hold back only a fragment with no line boundary; one ending in any
+        # str.splitlines boundary (not just \n/\r) is already a whole line.
+        tail = "" if parts[-1][-1] in _LINE_BOUNDARIES else parts.pop()
         for line in parts:
+            if self._line_buf:
+                line = self._line_buf + line
+                self._line_buf = ""
             self._capture_line(line)
+        self._line_buf += tail
 
     def _capture_line(self, line: str):
         self._total_lines += 1
@@ -20,6 +20,7 @@ import os
 import asyncio
 import re
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated
 
@@ -49,14 +50,17 @@ ESC_RE = re.compile(
     re.MULTILINE,
 )
 
+# Common control chars (BEL, etc). Newline, carriage return, tab and backspace
+# are kept for the line normalization below.
+CTRL_RE = re.compile(r"[\x00-\x07\x0b\x0c\x0e-\x1f\x7f]")
+
 
 def _maybe_strip_ansi(text: str, *, strip_ansi: bool) -> str:
     if not strip_ansi:
         return text
     s = ANSI_RE.sub("", text)
     s = ESC_RE.sub("", s)
-    # Drop common control chars (BEL, etc) but keep newline, carriage return, tab.
-    s = "".join(ch for ch in s if ch in {"\n", "\r", "\t", "\b"} or (ord(ch) >= 0x20 and ord(ch) != 0x7F))
+    s = CTRL_RE.sub("", s)
 
     # Best-effort line normalization for carriage-return and backspace overstrike.
     out_lines: list[str] = []
@@ -180,6 +184,13 @@ READY: bash prompt visible
 PASSWORD: SSH asking for password
 CONFIRM: apt asking to continue"""
 
+SAMPLED_STATE_RE = re.compile(r"\b(READY|PASSWORD|CONFIRM|REPL|EDITOR|PAGER|RUNNING|ERROR|UNKNOWN)\b")
+
+SHELL_PROMPT_ENDS = ("$", "#")
+
+# A prompt token followed by a command, e.g. "bash-5.3$ sleep 60" or "user@host:~$ make".
+RUNNING_COMMAND_RE = re.compile(r"[^\s$#%>]+[$#%>]\s+\S")
+
 
 class SessionManager:
     """Manages multiple PTY instances."""
@@ -339,7 +350,7 @@ async def interpret_terminal_state(
             if ":" in response:
                 state, reason = response.split(":", 1)
                 return state.strip().upper(), reason.strip()
-            m = re.search(r"\b(READY|PASSWORD|CONFIRM|REPL|EDITOR|PAGER|RUNNING|ERROR|UNKNOWN)\b", response.upper())
+            m = SAMPLED_STATE_RE.search(response.upper())
             if m:
                 state = m.group(1)
                 reason = response[m.end() :].strip(" \t\r\n:-")
@@ -384,6 +395,11 @@ async def determine_terminal_state(
         if heuristic_state != "RUNNING":
             return heuristic_state, heuristic_reason
 
+        # A command line just submitted at a prompt, with nothing drawn yet, is
+        # RUNNING; sampling cannot refine it, so skip the round-trip.
+        if _looks_like_running_command(screen, cursor_x):
+            return heuristic_state, f"{heuristic_reason} (sampling bypassed)"
+
         sampled_state, sampled_reason = await interpret_terminal_state(ctx, screen)
         if sampled_state in {"PASSWORD", "CONFIRM", "REPL", "EDITOR", "PAGER"}:
             return sampled_state, sampled_reason
@@ -398,6 +414,17 @@ async def determine_terminal_state(
     return heuristic_state, heuristic_reason
 
 
+def _looks_like_running_command(screen: str, cursor_x: int | None) -> bool:
+    """True if the cursor is at column 0 below a `<prompt> <command>` line."""
+    if cursor_x != 0:
+        return False
+    last_line = screen.rstrip().rsplit("\n", 1)[-1]
+    return RUNNING_COMMAND_RE.match(last_line) is not None
+
+
+# Pure function of its arguments. Tools often classify the same unchanged screen
+# several times in a row (e.g. get_screen then get_metadata), so keep a few results.
+@lru_cache(maxsize=8)
 def detect_state_heuristic(
     screen: str,
     *,
@@ -408,12 +435,12 @@ def detect_state_heuristic(
 
     Used as fallback when sampling unavailable.
     """
-    lines = screen.strip().split("\n")
+    # Heuristics should not get "stuck" on scrollback text. Prefer signals near the
+    # bottom of the visible screen, and only split off those lines.
+    lines = screen.strip().rsplit("\n", 12)
     if not lines:
         return "UNKNOWN", "empty screen"
 
-    # Heuristics should not get "stuck" on scrollback text. Prefer signals near the
-    # bottom of the visible screen.
     window = lines[-12:]
     window_lower = "\n".join(window).lower()
     tail_nonempty = [ln.rstrip() for ln in window if ln.strip()]
@@ -464,15 +491,13 @@ def detect_state_heuristic(
 
     # Shell prompts - must look like actual prompts, not progress bars
     # Require typical prompt structure: ends with $ # or > but not inside brackets
-    shell_ends = ["$", "#"]
     tail_last_stripped = tail_last.rstrip()
-    for end in shell_ends:
-        if tail_last_stripped.endswith(end):
-            if "%" in tail_last_stripped or ("[" in tail_last_stripped and "]" in tail_last_stripped):
-                break
-            if cursor_x is not None and cursor_x == 0:
-                return "RUNNING", "cursor at column 0"
-            return "READY", f"shell prompt '{end}'"
+    if tail_last_stripped.endswith(SHELL_PROMPT_ENDS) and not (
+        "%" in tail_last_stripped or ("[" in tail_last_stripped and "]" in tail_last_stripped)
+    ):
+        if cursor_x is not None and cursor_x == 0:
+            return "RUNNING", "cursor at column 0"
+        return "READY", f"shell prompt '{tail_last_stripped[-1]}'"
 
     # Special case: bare > prompt (but not inside progress bars or with percentages)
     if tail_last_stripped.endswith(">"):
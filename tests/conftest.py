@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fast_quiescence():
+    # MCP tools read the module-level window on every call; the default (1000ms)
+    # only adds idle time to tests that wait for short commands.
+    from piloty import mcp_server
+
+    prev = mcp_server.QUIESCENCE_MS
+    mcp_server.QUIESCENCE_MS = 50
+    yield
+    mcp_server.QUIESCENCE_MS = prev
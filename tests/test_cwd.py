@@ -1,5 +1,6 @@
 import json
 import os
+import re
 
 import anyio
 
@@ -8,6 +9,9 @@ from mcp.client.stdio import StdioServerParameters, stdio_client
 
 from piloty.core import PTY
 
+# Lines may be separated by bare "\r" (e.g. after bracketed-paste toggles).
+_ENV_RX = re.compile(r"(?<![^\r\n])([A-Z_][A-Z0-9_]*)=([^\r\n]*)")
+
 
 def test_pty_respects_initial_cwd(tmp_path):
     pty = PTY(session_id="test_cwd", cwd=str(tmp_path))
@@ -57,12 +61,8 @@ def test_server_requires_explicit_session_cwd(tmp_path):
     anyio.run(main)
 
 
-def _env_value_from_output(output: str, key: str) -> str:
-    for raw_line in output.splitlines():
-        line = raw_line.replace("\r", "").strip()
-        if line.startswith(f"{key}="):
-            return line.split("=", 1)[1]
-    raise AssertionError(f"missing key in output: {key}")
+def _env_map(output: str) -> dict[str, str]:
+    return dict(_ENV_RX.findall(output))
 
 
 def test_pty_strips_python_venv_env_vars(tmp_path, monkeypatch):
@@ -86,11 +86,12 @@ def test_pty_strips_python_venv_env_vars(tmp_path, monkeypatch):
             'printf "PATH=%s\\n" "$PATH"'
         )
         output = pty.type(f"{command}\n", timeout=5.0, quiescence_ms=300)["output"]
+        env = _env_map(output)
 
-        assert _env_value_from_output(output, "VIRTUAL_ENV") == ""
-        assert _env_value_from_output(output, "PYTHONHOME") == ""
-        assert _env_value_from_output(output, "PYTHONPATH") == ""
-        assert _env_value_from_output(output, "__PYVENV_LAUNCHER__") == ""
-        assert leaked_bin not in _env_value_from_output(output, "PATH")
+        assert env["VIRTUAL_ENV"] == ""
+        assert env["PYTHONHOME"] == ""
+        assert env["PYTHONPATH"] == ""
+        assert env["__PYVENV_LAUNCHER__"] == ""
+        assert leaked_bin not in env["PATH"]
     finally:
         pty.terminate()
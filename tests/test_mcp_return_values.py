@@ -4,8 +4,6 @@ from piloty import mcp_server
 
 
 def test_mcp_tool_shapes_include_status_and_prompt(tmp_path):
-    prev = mcp_server.QUIESCENCE_MS
-    mcp_server.QUIESCENCE_MS = 50
     session_id = "test_mcp_shapes"
     try:
         created = asyncio.run(mcp_server.create_session(session_id=session_id, cwd=str(tmp_path)))
@@ -39,7 +37,6 @@ def test_mcp_tool_shapes_include_status_and_prompt(tmp_path):
             asyncio.run(mcp_server.terminate(session_id))
         except Exception:
             pass
-        mcp_server.QUIESCENCE_MS = prev
 
 
 def test_mcp_terminate_is_final(tmp_path):
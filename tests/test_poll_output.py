@@ -1,10 +1,13 @@
 import shutil
 
+import pytest
 from mcp.server.fastmcp.utilities.context_injection import find_context_parameter
 
 from piloty import mcp_server
 from piloty.core import PTY
 
+_HAS_SSH = shutil.which("ssh") is not None
+
 
 def test_fastmcp_context_injection_detects_ctx_param():
     assert find_context_parameter(mcp_server.run) == "ctx"
@@ -44,12 +47,24 @@ def test_transcript_written():
         pty.terminate()
 
 
+@pytest.mark.skipif(not _HAS_SSH, reason="ssh not installed")
 def test_ssh_version_does_not_crash_when_present():
-    if shutil.which("ssh") is None:
-        return
     pty = PTY(session_id="test_ssh_version")
     try:
         r = pty.type("ssh -V\n", timeout=5.0)
         assert r["status"] in ("quiescent", "timeout")
     finally:
         pty.terminate()
+
+
+def test_capture_chunk_joins_split_lines_like_a_whole_buffer_split():
+    pty = PTY(session_id="test_capture_chunks")
+    try:
+        pty._capture_reset()
+        for chunk in ["hel", "lo wor", "ld\n", "a\r", "\nb\x0c", "c\n", "tail"]:
+            pty._capture_chunk(chunk)
+        assert pty._capture_output() == "hello world\na\r\nb\x0cc\ntail"
+        assert pty._full_lines == ["hello world\n", "a\r", "\n", "b\x0c", "c\n", "tail"]
+        assert pty._total_lines == 6
+    finally:
+        pty.terminate()
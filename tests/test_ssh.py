@@ -1,15 +1,17 @@
 import shutil
 
-from piloty.core import PTY
+import pytest
 
+_HAS_SSH = shutil.which("ssh") is not None
 
+
+@pytest.mark.skipif(not _HAS_SSH, reason="ssh not installed")
 def test_ssh_client_invocation_isolated():
-    if shutil.which("ssh") is None:
-        return
+    from piloty.core import PTY
+
     pty = PTY(session_id="test_ssh_help")
     try:
-        r = pty.type("ssh -G localhost >/dev/null 2>&1; echo $?\n", timeout=5.0)
+        r = pty.type("ssh -G localhost >/dev/null 2>&1; echo $?\n", timeout=5.0, quiescence_ms=300)
         assert r["status"] == "quiescent"
     finally:
         pty.terminate()
-
@@ -4,9 +4,67 @@ from types import SimpleNamespace
 
 from piloty import mcp_server
 
+# One loop for the whole module; asyncio.run() builds and tears down a loop per call.
+_LOOP = asyncio.new_event_loop()
+
+
+def _run(coro):
+    return _LOOP.run_until_complete(coro)
+
+
+def teardown_module():
+    _LOOP.close()
+
+
+_SCREEN_TRACEBACK_PDB = "\n".join(
+    [
+        "Traceback (most recent call last):",
+        "  File \"x.py\", line 1, in <module>",
+        "IndexError: list index out of range",
+        "(Pdb) ",
+    ]
+)
+
+_SCREEN_TRACEBACK_THEN_PROMPT = "\n".join(
+    [
+        "Traceback (most recent call last):",
+        "  File \"x.py\", line 1, in <module>",
+        "IndexError: list index out of range",
+        "",
+        "more unrelated output",
+        "",
+        "bash-5.3$",
+        "",
+    ]
+)
+
+_SCREEN_PASSWORD_THEN_PROMPT = "\n".join(
+    [
+        "Password:",
+        "Authentication failed",
+        "",
+        "bash-5.3$",
+    ]
+)
+
+_SCREEN_CONFIRM_THEN_PROMPT = "\n".join(
+    [
+        "Proceed? [y/n]",
+        "",
+        "bash-5.3$",
+    ]
+)
+
+_SCREEN_PDB_THEN_PROMPT = "\n".join(
+    [
+        "(Pdb) ",
+        "bash-5.3$",
+    ]
+)
+
 
 def test_determine_terminal_state_uses_heuristic_without_ctx():
-    state, reason = asyncio.run(mcp_server.determine_terminal_state(None, "bash-5.3$", cursor_x=10))
+    state, reason = _run(mcp_server.determine_terminal_state(None, "bash-5.3$", cursor_x=10))
     assert state == "READY"
     assert "shell prompt" in reason
 
@@ -17,7 +75,7 @@ def test_determine_terminal_state_uses_heuristic_without_sampling_capability():
     session = SimpleNamespace(client_params=client_params)
     ctx = SimpleNamespace(session=session)
 
-    state, reason = asyncio.run(mcp_server.determine_terminal_state(ctx, "bash-5.3$", cursor_x=10))
+    state, reason = _run(mcp_server.determine_terminal_state(ctx, "bash-5.3$", cursor_x=10))
     assert state == "READY"
     assert "shell prompt" in reason
 
@@ -30,7 +88,7 @@ def test_determine_terminal_state_falls_back_when_sampling_raises():
             raise RuntimeError("sampling unavailable")
 
     ctx = SimpleNamespace(session=BrokenSession())
-    state, reason = asyncio.run(mcp_server.determine_terminal_state(ctx, "no prompt here", cursor_x=0))
+    state, reason = _run(mcp_server.determine_terminal_state(ctx, "no prompt here", cursor_x=0))
     assert state == "RUNNING"
     assert "sampling=UNKNOWN" in reason
     assert "sampling unavailable" in reason
@@ -44,7 +102,7 @@ def test_determine_terminal_state_uses_sampling_when_parsable():
             return SimpleNamespace(content=SimpleNamespace(type="text", text="CONFIRM: waiting for confirmation"))
 
     ctx = SimpleNamespace(session=GoodSession())
-    state, reason = asyncio.run(mcp_server.determine_terminal_state(ctx, "anything", cursor_x=0))
+    state, reason = _run(mcp_server.determine_terminal_state(ctx, "anything", cursor_x=0))
     assert state == "CONFIRM"
     assert reason == "waiting for confirmation"
 
@@ -57,21 +115,13 @@ def test_determine_terminal_state_falls_back_when_sampling_unparsable():
             return SimpleNamespace(content=SimpleNamespace(type="text", text="I refuse to follow instructions"))
 
     ctx = SimpleNamespace(session=WeirdSession())
-    state, reason = asyncio.run(mcp_server.determine_terminal_state(ctx, "no prompt here", cursor_x=0))
+    state, reason = _run(mcp_server.determine_terminal_state(ctx, "no prompt here", cursor_x=0))
     assert state == "RUNNING"
     assert "sampling=UNKNOWN" in reason
 
 
 def test_heuristic_prefers_pdb_prompt_over_traceback_text():
-    screen = "\n".join(
-        [
-            "Traceback (most recent call last):",
-            "  File \"x.py\", line 1, in <module>",
-            "IndexError: list index out of range",
-            "(Pdb) ",
-        ]
-    )
-    state, reason = mcp_server.detect_state_heuristic(screen, cursor_x=6)
+    state, reason = mcp_server.detect_state_heuristic(_SCREEN_TRACEBACK_PDB, cursor_x=6)
     assert state == "REPL"
     assert "pdb prompt" in reason
 
@@ -90,41 +140,50 @@ def test_sampling_ready_does_not_override_running_command_line():
             return SimpleNamespace(content=SimpleNamespace(type="text", text="READY: prompt visible"))
 
     ctx = SimpleNamespace(session=ReadySession())
-    screen = "bash-5.3$ sleep 60"
-    state, reason = asyncio.run(mcp_server.determine_terminal_state(ctx, screen, cursor_x=0))
+    screen = "compiling..."
+    state, reason = _run(mcp_server.determine_terminal_state(ctx, screen, cursor_x=0))
     assert state == "RUNNING"
     assert "sampling=READY" in reason
 
 
-def test_expect_matches_already_visible_screen():
-    import asyncio
+def test_sampling_bypassed_for_submitted_command_line():
+    class ReadySession:
+        client_params = SimpleNamespace(capabilities=SimpleNamespace(sampling=SimpleNamespace()))
+        calls = 0
 
-    from piloty import mcp_server
+        async def create_message(self, *args, **kwargs):
+            ReadySession.calls += 1
+            return SimpleNamespace(content=SimpleNamespace(type="text", text="READY: prompt visible"))
 
+    ctx = SimpleNamespace(session=ReadySession())
+    screen = "bash-5.3$ sleep 60"
+    state, reason = _run(mcp_server.determine_terminal_state(ctx, screen, cursor_x=0))
+    assert state == "RUNNING"
+    assert "sampling bypassed" in reason
+    assert ReadySession.calls == 0
+
+
+def test_expect_matches_already_visible_screen():
     session_id = "test_expect_visible"
     try:
-        asyncio.run(mcp_server.create_session(session_id=session_id, cwd=os.getcwd()))
-        asyncio.run(mcp_server.run(session_id=session_id, command="echo EXPECTME", timeout=2.0))
-        r = asyncio.run(mcp_server.expect(session_id=session_id, pattern="EXPECTME", timeout=0.1))
+        _run(mcp_server.create_session(session_id=session_id, cwd=os.getcwd()))
+        _run(mcp_server.run(session_id=session_id, command="echo EXPECTME", timeout=2.0))
+        r = _run(mcp_server.expect(session_id=session_id, pattern="EXPECTME", timeout=0.1))
         assert r["matched"] is True
         assert r["timed_out"] is False
         assert r["match"] == "EXPECTME"
     finally:
         try:
-            asyncio.run(mcp_server.terminate(session_id))
+            _run(mcp_server.terminate(session_id))
         except Exception:
             pass
 
 
 def test_expect_prompt_waits_for_prompt_after_timeout_run():
-    import asyncio
-
-    from piloty import mcp_server
-
     session_id = "test_expect_prompt"
     try:
-        asyncio.run(mcp_server.create_session(session_id=session_id, cwd=os.getcwd()))
-        r = asyncio.run(
+        _run(mcp_server.create_session(session_id=session_id, cwd=os.getcwd()))
+        r = _run(
             mcp_server.run(
                 session_id=session_id,
                 command="sh -c 'sleep 0.4'",
@@ -133,57 +192,30 @@ def test_expect_prompt_waits_for_prompt_after_timeout_run():
         )
         assert r["status"] in {"running", "unknown"}
 
-        r2 = asyncio.run(mcp_server.expect_prompt(session_id=session_id, timeout=2.0))
+        r2 = _run(mcp_server.expect_prompt(session_id=session_id, timeout=2.0))
         assert r2["matched"] is True
         assert r2["timed_out"] is False
         assert r2["status"] == "ready"
         assert r2["prompt"] == "shell"
     finally:
         try:
-            asyncio.run(mcp_server.terminate(session_id))
+            _run(mcp_server.terminate(session_id))
         except Exception:
             pass
 
 
 def test_traceback_in_scrollback_does_not_override_prompt():
-    screen = "\n".join(
-        [
-            "Traceback (most recent call last):",
-            "  File \"x.py\", line 1, in <module>",
-            "IndexError: list index out of range",
-            "",
-            "more unrelated output",
-            "",
-            "bash-5.3$",
-            "",
-        ]
-    )
-    state, _reason = mcp_server.detect_state_heuristic(screen, cursor_x=10)
+    state, _reason = mcp_server.detect_state_heuristic(_SCREEN_TRACEBACK_THEN_PROMPT, cursor_x=10)
     assert state == "READY"
 
 
 def test_old_password_text_in_scrollback_does_not_override_prompt():
-    screen = "\n".join(
-        [
-            "Password:",
-            "Authentication failed",
-            "",
-            "bash-5.3$",
-        ]
-    )
-    state, _reason = mcp_server.detect_state_heuristic(screen, cursor_x=10)
+    state, _reason = mcp_server.detect_state_heuristic(_SCREEN_PASSWORD_THEN_PROMPT, cursor_x=10)
     assert state == "READY"
 
 
 def test_old_confirm_text_in_scrollback_does_not_override_prompt():
-    screen = "\n".join(
-        [
-            "Proceed? [y/n]",
-            "",
-            "bash-5.3$",
-        ]
-    )
-    state, _reason = mcp_server.detect_state_heuristic(screen, cursor_x=10)
+    state, _reason = mcp_server.detect_state_heuristic(_SCREEN_CONFIRM_THEN_PROMPT, cursor_x=10)
     assert state == "READY"
 
 
@@ -206,8 +238,7 @@ def test_shell_prompt_not_detected_from_command_line_user_host():
 
 
 def test_pdb_prompt_in_scrollback_does_not_override_shell_prompt():
-    screen = "\n".join(["(Pdb) ", "bash-5.3$"])
-    state, _reason = mcp_server.detect_state_heuristic(screen, cursor_x=10)
+    state, _reason = mcp_server.detect_state_heuristic(_SCREEN_PDB_THEN_PROMPT, cursor_x=10)
     assert state == "READY"
 
 
@@ -6,29 +6,45 @@ Uses quiescence-based PTY with heuristic state detection.
 Human acts as the "sampling LLM" for complex state interpretation.
 """
 
+import atexit
 import sys
 from pathlib import Path
 
+try:
+    import readline
+except ImportError:  # Not available on all platforms (e.g. Windows).
+    readline = None
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from piloty.core import PTY
 from piloty.mcp_server import detect_state_heuristic
 
+HISTORY_FILE = Path.home() / ".piloty" / "playground_history"
+
+# Ctrl+letter for a-z, plus ESC.
+CONTROL_CHARS = {chr(ord("a") + i): chr(i + 1) for i in range(26)}
+CONTROL_CHARS.update({"[": "\x1b", "esc": "\x1b", "escape": "\x1b"})
+
+
+def _snapshot_and_state(pty):
+    """Take one screen snapshot and classify it. Returns (screen, state, reason)."""
+    snap = pty.screen_snapshot()
+    screen = snap["screen"]
+    state, reason = detect_state_heuristic(screen, cursor_x=snap.get("cursor_x"))
+    return screen, state, reason
+
 
 def show_help():
     """Show available commands."""
+    print("\nCommands:")
+    seen = set()
+    for handler in SLASH_COMMANDS.values():
+        if handler in seen:
+            continue
+        seen.add(handler)
+        print(f"  {handler.__doc__}")
     print("""
-Commands:
-  /help          - Show this help
-  /exit, /quit   - Exit playground
-	  /get_screen    - Get current screen content
-	  /state         - Detect terminal state (heuristic)
-	  /transcript    - Show transcript file path
-	  /poll_output [timeout] - Wait up to timeout for new output (no input)
-	  /check_jobs    - Run 'jobs -l' in session
-	  /ctrl <key>    - Send control character (c, d, z, l, [)
-	  /status        - Show PTY status
-
 Input:
   Regular text (without /) is sent as a command with newline.
   Use /raw <text> to send without newline.
@@ -39,24 +55,148 @@ Input:
 def send_control(pty, key):
     """Send control character."""
     key = key.lower()
-    if key == "[" or key == "escape" or key == "esc":
-        char = "\x1b"
-    elif len(key) == 1 and key.isalpha():
-        char = chr(ord(key) - ord("a") + 1)
-    else:
+    char = CONTROL_CHARS.get(key)
+    if char is None:
         print(f"Unknown control key: {key}")
         return
 
     result = pty.type(char, timeout=2.0, quiescence_ms=300)
     print(f"Status: {result['status']}")
-    snap = pty.screen_snapshot()
-    screen = snap["screen"]
-    state, reason = detect_state_heuristic(screen, cursor_x=snap.get("cursor_x"))
+    screen, state, reason = _snapshot_and_state(pty)
     print(f"State: {state} ({reason})")
     print(f"Screen:\n{screen}")
 
 
+def _cmd_exit(pty, args):
+    """/exit, /quit   - Exit playground"""
+    return True
+
+
+def _cmd_help(pty, args):
+    """/help          - Show this help"""
+    show_help()
+
+
+def _cmd_get_screen(pty, args):
+    """/get_screen    - Get current screen content"""
+    snap = pty.screen_snapshot()
+    print(f"\nScreen:\n{snap['screen']}")
+
+
+def _cmd_state(pty, args):
+    """/state         - Detect terminal state (heuristic)"""
+    _screen, state, reason = _snapshot_and_state(pty)
+    print(f"\nState: {state}")
+    print(f"Reason: {reason}")
+
+
+def _cmd_transcript(pty, args):
+    """/transcript    - Show transcript file path"""
+    print(f"\nTranscript: {pty.transcript()}")
+
+
+def _cmd_poll_output(pty, args):
+    """/poll_output [timeout] - Wait up to timeout for new output (no input)"""
+    t = 0.1
+    if args:
+        try:
+            t = float(args.strip())
+        except ValueError:
+            print("Usage: /poll_output [timeout]")
+            return
+    result = pty.poll_output(timeout=t, quiescence_ms=100)
+    print(f"\nStatus: {result['status']}")
+    print(f"Output:\n{result['output']}")
+
+
+def _cmd_check_jobs(pty, args):
+    """/check_jobs    - Run 'jobs -l' in session"""
+    result = pty.type("jobs -l\n", timeout=2.0, quiescence_ms=300)
+    print(f"\nStatus: {result['status']}")
+    print(f"Output:\n{result['output']}")
+
+
+def _cmd_ctrl(pty, args):
+    """/ctrl <key>    - Send control character (c, d, z, l, [)"""
+    if args:
+        send_control(pty, args)
+    else:
+        print("Usage: /ctrl <key>")
+
+
+def _cmd_status(pty, args):
+    """/status        - Show PTY status"""
+    print(f"\nAlive: {pty.alive}")
+    print(f"Transcript: {pty.transcript()}")
+    _screen, state, reason = _snapshot_and_state(pty)
+    print(f"State: {state} ({reason})")
+
+
+def _cmd_raw(pty, args):
+    """/raw <text>    - Send text without a trailing newline"""
+    if args:
+        result = pty.type(args, timeout=30.0, quiescence_ms=500)
+        print(f"Status: {result['status']}")
+        _screen, state, reason = _snapshot_and_state(pty)
+        print(f"State: {state} ({reason})")
+        print(f"Output:\n{result['output']}")
+    else:
+        print("Usage: /raw <text>")
+
+
+# Slash command -> handler(pty, args). A handler returns True to exit the playground.
+SLASH_COMMANDS = {
+    "/help": _cmd_help,
+    "/exit": _cmd_exit,
+    "/quit": _cmd_exit,
+    "/get_screen": _cmd_get_screen,
+    "/state": _cmd_state,
+    "/transcript": _cmd_transcript,
+    "/poll_output": _cmd_poll_output,
+    "/check_jobs": _cmd_check_jobs,
+    "/ctrl": _cmd_ctrl,
+    "/status": _cmd_status,
+    "/raw": _cmd_raw,
+}
+
+
+def handle_slash_command(pty, command):
+    """Dispatch a slash command. Returns True if the playground should exit."""
+    parts = command.split(maxsplit=1)
+    cmd = parts[0].lower()
+    args = parts[1] if len(parts) > 1 else ""
+
+    handler = SLASH_COMMANDS.get(cmd)
+    if handler is None:
+        print(f"Unknown command: {cmd}")
+        print("Type /help for available commands")
+        return False
+    return bool(handler(pty, args))
+
+
+def _setup_readline():
+    """Enable line editing and persistent history for the input prompt."""
+    if readline is None:
+        return
+    readline.parse_and_bind("tab: complete")
+    readline.set_history_length(1000)
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+
+    def save_history():
+        try:
+            HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            readline.write_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+
+    atexit.register(save_history)
+
+
 def main():
+    _setup_readline()
     pty = PTY(session_id="playground")
 
     print("PTY Playground - Quiescence-based Terminal")
@@ -66,9 +206,7 @@ def main():
     print("-" * 50)
 
     # Show initial screen
-    snap = pty.screen_snapshot()
-    screen = snap["screen"]
-    state, reason = detect_state_heuristic(screen, cursor_x=snap.get("cursor_x"))
+    screen, state, reason = _snapshot_and_state(pty)
     print(f"\nInitial state: {state} ({reason})")
     print(f"Screen:\n{screen}")
 
@@ -84,77 +222,8 @@ def main():
 
             # Slash commands
             if command.startswith("/"):
-                parts = command.split(maxsplit=1)
-                cmd = parts[0].lower()
-                args = parts[1] if len(parts) > 1 else ""
-
-                if cmd in ["/exit", "/quit"]:
+                if handle_slash_command(pty, command):
                     break
-
-                elif cmd == "/help":
-                    show_help()
-
-                elif cmd == "/get_screen":
-                    snap = pty.screen_snapshot()
-                    print(f"\nScreen:\n{snap['screen']}")
-
-                elif cmd == "/state":
-                    snap = pty.screen_snapshot()
-                    screen = snap["screen"]
-                    state, reason = detect_state_heuristic(screen, cursor_x=snap.get("cursor_x"))
-                    print(f"\nState: {state}")
-                    print(f"Reason: {reason}")
-
-                elif cmd == "/transcript":
-                    print(f"\nTranscript: {pty.transcript()}")
-
-                elif cmd == "/poll_output":
-                    t = 0.1
-                    if args:
-                        try:
-                            t = float(args.strip())
-                        except ValueError:
-                            print("Usage: /poll_output [timeout]")
-                            continue
-                    result = pty.poll_output(timeout=t, quiescence_ms=100)
-                    print(f"\nStatus: {result['status']}")
-                    print(f"Output:\n{result['output']}")
-
-                elif cmd == "/check_jobs":
-                    result = pty.type("jobs -l\n", timeout=2.0, quiescence_ms=300)
-                    print(f"\nStatus: {result['status']}")
-                    print(f"Output:\n{result['output']}")
-
-                elif cmd == "/ctrl":
-                    if args:
-                        send_control(pty, args)
-                    else:
-                        print("Usage: /ctrl <key>")
-
-                elif cmd == "/status":
-                    print(f"\nAlive: {pty.alive}")
-                    print(f"Transcript: {pty.transcript()}")
-                    snap = pty.screen_snapshot()
-                    screen = snap["screen"]
-                    state, reason = detect_state_heuristic(screen, cursor_x=snap.get("cursor_x"))
-                    print(f"State: {state} ({reason})")
-
-                elif cmd == "/raw":
-                    if args:
-                        result = pty.type(args, timeout=30.0, quiescence_ms=500)
-                        print(f"Status: {result['status']}")
-                        snap = pty.screen_snapshot()
-                        screen = snap["screen"]
-                        state, reason = detect_state_heuristic(screen, cursor_x=snap.get("cursor_x"))
-                        print(f"State: {state} ({reason})")
-                        print(f"Output:\n{result['output']}")
-                    else:
-                        print("Usage: /raw <text>")
-
-                else:
-                    print(f"Unknown command: {cmd}")
-                    print("Type /help for available commands")
-
                 continue
 
             # Regular command - send with newline
@@ -162,9 +231,7 @@ def main():
             result = pty.type(command + "\n", timeout=30.0, quiescence_ms=500)
             print(f"Status: {result['status']}")
 
-            snap = pty.screen_snapshot()
-            screen = snap["screen"]
-            state, reason = detect_state_heuristic(screen, cursor_x=snap.get("cursor_x"))
+            _screen, state, reason = _snapshot_and_state(pty)
             print(f"State: {state} ({reason})")
             print(f"Output:\n{result['output']}")
 
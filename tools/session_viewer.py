@@ -7,94 +7,117 @@ logged under ~/.piloty/
 """
 import sys
 import json
-import argparse
+import getopt
+import io
 from pathlib import Path
-from datetime import datetime
 import os
+import re
+import shutil
+import time
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 
 
-def get_piloty_dir():
-    """Get the PiloTY directory path."""
-    return Path.home() / ".piloty"
+_PILOTY_DIR = Path.home() / ".piloty"
 
 
-def _active_sessions():
-    piloty_dir = get_piloty_dir()
-    active_dir = piloty_dir / "active"
-    if not active_dir.exists():
+def _scandir_sorted(path):
+    """Return DirEntry objects for *path* sorted by name ([] if missing)."""
+    try:
+        with os.scandir(path) as it:
+            return sorted(it, key=lambda e: e.name)
+    except (FileNotFoundError, NotADirectoryError):
         return []
 
+
+def _active_sessions():
+    active_dir = os.path.join(_PILOTY_DIR, "active")
+
     out = []
-    for server_dir in sorted(active_dir.iterdir()):
-        if not server_dir.is_dir():
+    for server_entry in _scandir_sorted(active_dir):
+        if not server_entry.is_dir(follow_symlinks=False):
             continue
-        for link in sorted(server_dir.iterdir()):
+        for link in _scandir_sorted(server_entry.path):
             if not link.is_symlink():
                 continue
-            out.append((server_dir.name, link.name, link, link.resolve()))
+            # Readers open files through the link; resolve only when needed.
+            out.append((server_entry.name, link.name, link.path))
     return out
 
 
 def _all_sessions():
-    piloty_dir = get_piloty_dir()
-    servers_dir = piloty_dir / "servers"
-    if not servers_dir.exists():
-        return []
+    servers_dir = os.path.join(_PILOTY_DIR, "servers")
 
     out = []
-    for server_dir in sorted(servers_dir.iterdir()):
-        sessions_dir = server_dir / "sessions"
-        if not sessions_dir.exists():
-            continue
-        for session_dir in sorted(sessions_dir.iterdir()):
-            if not session_dir.is_dir():
+    for server_entry in _scandir_sorted(servers_dir):
+        sessions_dir = os.path.join(server_entry.path, "sessions")
+        for session_entry in _scandir_sorted(sessions_dir):
+            if not session_entry.is_dir():
                 continue
-            out.append((server_dir.name, session_dir.name, session_dir))
+            out.append((server_entry.name, session_entry.name, session_entry.path))
     return out
 
 
-def _resolve_session_ref(session_ref: str) -> tuple[str, Path] | None:
-    piloty_dir = get_piloty_dir()
+def _sessions_named(base: str, subdir: str, session_id: str, is_session):
+    """Find ``base/<server>/<subdir>/<session_id>`` across servers.
+
+    Probes the one candidate path per server instead of listing every session.
+    """
+    if session_id in ("", ".", ".."):
+        return []
+    out = []
+    for server_entry in _scandir_sorted(base):
+        path = os.path.join(server_entry.path, subdir, session_id)
+        if is_session(path):
+            out.append((server_entry.name, session_id, path))
+    return out
 
+
+@lru_cache(maxsize=128)
+def _lookup_session_ref(session_ref: str) -> tuple[tuple[str, Path] | None, str | None]:
+    """Resolve *session_ref* without printing; returns (match, error message)."""
     if "/" in session_ref:
         server_id, session_id = session_ref.split("/", 1)
-        active_link = piloty_dir / "active" / server_id / session_id
-        if active_link.exists() and active_link.is_symlink():
-            return (f"{server_id}/{session_id}", active_link.resolve())
+        active_link = os.path.join(_PILOTY_DIR, "active", server_id, session_id)
+        if os.path.exists(active_link) and os.path.islink(active_link):
+            return (f"{server_id}/{session_id}", Path(os.path.realpath(active_link))), None
 
-        session_dir = piloty_dir / "servers" / server_id / "sessions" / session_id
-        if session_dir.exists() and session_dir.is_dir():
-            return (f"{server_id}/{session_id}", session_dir)
+        session_dir = os.path.join(_PILOTY_DIR, "servers", server_id, "sessions", session_id)
+        if os.path.isdir(session_dir):
+            return (f"{server_id}/{session_id}", Path(session_dir)), None
 
-        print(f"Session '{server_id}/{session_id}' not found.")
-        return None
+        return None, f"Session '{server_id}/{session_id}' not found."
 
-    active_matches = [
-        (server_id, sid, path)
-        for (server_id, sid, _link, path) in _active_sessions()
-        if sid == session_ref
-    ]
+    active_matches = _sessions_named(
+        os.path.join(_PILOTY_DIR, "active"), "", session_ref, os.path.islink
+    )
     if len(active_matches) == 1:
         server_id, sid, path = active_matches[0]
-        return (f"{server_id}/{sid}", path)
+        return (f"{server_id}/{sid}", Path(os.path.realpath(path))), None
     if len(active_matches) > 1:
         matches = ", ".join(f"{server_id}/{sid}" for (server_id, sid, _p) in active_matches)
-        print(f"Ambiguous session id '{session_ref}'. Matches: {matches}")
-        return None
+        return None, f"Ambiguous session id '{session_ref}'. Matches: {matches}"
 
-    all_matches = [
-        (server_id, sid, path) for (server_id, sid, path) in _all_sessions() if sid == session_ref
-    ]
+    all_matches = _sessions_named(
+        os.path.join(_PILOTY_DIR, "servers"), "sessions", session_ref, os.path.isdir
+    )
     if len(all_matches) == 1:
         server_id, sid, path = all_matches[0]
-        return (f"{server_id}/{sid}", path)
+        return (f"{server_id}/{sid}", Path(path)), None
     if len(all_matches) > 1:
         matches = ", ".join(f"{server_id}/{sid}" for (server_id, sid, _p) in all_matches)
-        print(f"Ambiguous session id '{session_ref}'. Matches: {matches}")
-        return None
+        return None, f"Ambiguous session id '{session_ref}'. Matches: {matches}"
+
+    return None, f"Session '{session_ref}' not found."
+
 
-    print(f"Session '{session_ref}' not found.")
-    return None
+def _resolve_session_ref(session_ref: str) -> tuple[str, Path] | None:
+    match, error = _lookup_session_ref(session_ref)
+    if error:
+        print(error)
+    return match
 
 
 def list_sessions(show_all=False):
@@ -104,51 +127,120 @@ def list_sessions(show_all=False):
         if not sessions:
             print("No sessions found.")
             return
-        print(f"\nAll sessions ({len(sessions)} total):")
+        header = f"\nAll sessions ({len(sessions)} total):"
     else:
         sessions = _active_sessions()
         if not sessions:
             print("No active sessions found.")
             return
-        print(f"\nActive sessions ({len(sessions)} total):")
+        header = f"\nActive sessions ({len(sessions)} total):"
+
+    entries = [(f"{server_id}/{session_id}", path) for server_id, session_id, path in sessions]
+
+    # Each summary is an open+read of session.json (plus a PID probe); run
+    # them concurrently so a slow filesystem does not serialize the listing.
+    live_pids = None if show_all else _live_pids()
+    with ThreadPoolExecutor(max_workers=min(32, len(entries))) as pool:
+        lines = pool.map(
+            lambda entry: _session_summary(entry[0], entry[1], show_all, live_pids),
+            entries,
+        )
+        output = [header, *lines]
+    # One write for the whole listing rather than a flush per row on a TTY.
+    sys.stdout.write("\n".join(output) + "\n")
+
+
+def _read_bytes(path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _load_json(path):
+    """Parse a small JSON file from raw bytes, skipping the text-mode decode layer."""
+    return json.loads(_read_bytes(path))
+
+
+# session.json is a flat object written by PTY._write_session_meta; the
+# listing only needs these three fields, so pull them out without a full parse.
+_START_TIME_RE = re.compile(rb'"start_time"\s*:\s*"([^"]*)"')
+_PID_RE = re.compile(rb'"pid"\s*:\s*(\d+)')
+_END_TIME_RE = re.compile(rb'"end_time"\s*:\s*"([^"]*)"')
+
+
+def _read_session_fields(path) -> tuple[str, int, str | None]:
+    """Return (start_time, pid, end_time) from a session.json file."""
+    data = _read_bytes(path)
+    start_match = _START_TIME_RE.search(data)
+    pid_match = _PID_RE.search(data)
+    if start_match is None or pid_match is None:
+        # Unexpected layout (or a null pid): defer to the real parser.
+        metadata = json.loads(data)
+        return metadata['start_time'], metadata['pid'], metadata.get('end_time')
+    end_match = _END_TIME_RE.search(data)
+    return (
+        start_match.group(1).decode(),
+        int(pid_match.group(1)),
+        end_match.group(1).decode() if end_match else None,
+    )
+
+
+def _read_pid(path) -> int | None:
+    """Return the pid recorded in a session.json file."""
+    data = _read_bytes(path)
+    match = _PID_RE.search(data)
+    if match is None:
+        return json.loads(data)['pid']
+    return int(match.group(1))
+
+
+def _check_pid(pid: int) -> bool:
+    """Return False only if no process with *pid* exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
 
-    if show_all:
-        for server_id, session_id, actual_path in sessions:
-            display = f"{server_id}/{session_id}"
-            session_path = actual_path
-            _print_session_summary(display, session_path, show_all=True)
+
+def _live_pids() -> set[int] | None:
+    """Return every PID listed in /proc, or None where /proc is unavailable."""
+    try:
+        names = os.listdir("/proc")
+    except OSError:
+        return None
+    pids = {int(name) for name in names if name.isdigit()}
+    return pids or None
+
+
+def _pid_is_alive(pid: int, live_pids: set[int] | None = None) -> bool:
+    # The /proc snapshot can only confirm a pid: one started after it was
+    # taken (a new session's shell) is missing, so re-probe every miss.
+    if live_pids is not None and pid in live_pids:
+        return True
+    return _check_pid(pid)
+
+
+def _session_summary(
+    display: str, session_path: str, show_all: bool, live_pids: set[int] | None
+) -> str:
+    # Read session metadata
+    session_file = os.path.join(session_path, "session.json")
+    if not os.path.exists(session_file):
+        return f"  {display} - (no metadata)"
+
+    start_time, pid, end_time = _read_session_fields(session_file)
+    # start_time is datetime.isoformat() output; keep "YYYY-MM-DD HH:MM:SS".
+    started = start_time[:19].replace("T", " ")
+
+    # Check if process is still running
+    if not show_all:
+        status = "running" if _pid_is_alive(pid, live_pids) else "dead"
     else:
-        for server_id, session_id, _link, actual_path in sessions:
-            display = f"{server_id}/{session_id}"
-            session_path = actual_path
-            _print_session_summary(display, session_path, show_all=False)
-
-
-def _print_session_summary(display: str, session_path: Path, show_all: bool):
-        # Read session metadata
-        session_file = session_path / "session.json"
-        if session_file.exists():
-            with open(session_file) as f:
-                metadata = json.load(f)
-                
-            start_time = datetime.fromisoformat(metadata['start_time'])
-            pid = metadata['pid']
-            
-            # Check if process is still running
-            if not show_all:
-                try:
-                    os.kill(pid, 0)  # Check if process exists
-                    status = "running"
-                except ProcessLookupError:
-                    status = "dead"
-            else:
-                status = "ended" if metadata.get('end_time') else "unknown"
-                
-            print(
-                f"  {display} - Started: {start_time.strftime('%Y-%m-%d %H:%M:%S')} - PID: {pid} - Status: {status}"
-            )
-        else:
-            print(f"  {display} - (no metadata)")
+        status = "ended" if end_time else "unknown"
+
+    return (
+        f"  {display} - Started: {started} - PID: {pid} - Status: {status}"
+    )
 
 
 def show_session_info(session_id):
@@ -164,8 +256,7 @@ def show_session_info(session_id):
     # Show metadata
     session_file = session_path / "session.json"
     if session_file.exists():
-        with open(session_file) as f:
-            metadata = json.load(f)
+        metadata = _load_json(session_file)
         
         print("\nMetadata:")
         print(f"  Start time: {metadata['start_time']}")
@@ -176,8 +267,7 @@ def show_session_info(session_id):
     # Show current state
     state_file = session_path / "state.json"
     if state_file.exists():
-        with open(state_file) as f:
-            state = json.load(f)
+        state = _load_json(state_file)
             
         print("\nCurrent State:")
         print(f"  VT100 OK: {state.get('vt100_ok', 'unknown')}")
@@ -186,12 +276,16 @@ def show_session_info(session_id):
         print(f"  Transcript: {state.get('transcript', 'unknown')}")
             
     # Show files
+    log_files = ('commands.log', 'transcript.log', 'interaction.log')
+    sizes = {
+        entry.name: entry.stat().st_size
+        for entry in _scandir_sorted(session_path)
+        if entry.name in log_files
+    }
     print("\nLog Files:")
-    for log_file in ['commands.log', 'transcript.log', 'interaction.log']:
-        file_path = session_path / log_file
-        if file_path.exists():
-            size = file_path.stat().st_size
-            print(f"  {log_file}: {size:,} bytes")
+    for log_file in log_files:
+        if log_file in sizes:
+            print(f"  {log_file}: {sizes[log_file]:,} bytes")
 
 
 def show_commands(session_id, last_n=None):
@@ -206,16 +300,45 @@ def show_commands(session_id, last_n=None):
         print("No commands log found.")
         return
         
-    with open(commands_file) as f:
-        lines = f.readlines()
-        
-    if last_n:
-        lines = lines[-last_n:]
-        
     print(f"\nCommands from session {display}:")
     print("-" * 50)
-    for line in lines:
-        print(line.rstrip())
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    with open(commands_file, "rb") as f:
+        lines = deque(f, maxlen=last_n) if last_n else f
+        out.writelines(line.rstrip() + b"\n" for line in lines)
+    out.flush()
+
+
+def _tail_offset(f, seps: tuple[bytes, ...], n: int, chunk_size: int = 64 * 1024) -> int:
+    """Return the offset of the n-th last separator (any of *seps*) in binary file *f*.
+
+    Scans backwards in chunks. If the file has fewer than *n* separators the
+    first one is returned, and 0 if it has none. Separators must not overlap
+    one another.
+    """
+    pos = f.seek(0, os.SEEK_END)
+    found = 0
+    count = 0
+    carry = b""
+    while pos > 0:
+        step = min(chunk_size, pos)
+        pos -= step
+        f.seek(pos)
+        # Append the head of the previous chunk so separators spanning the
+        # boundary are seen; none can start inside the carried bytes.
+        buf = f.read(step) + carry
+        idx = len(buf)
+        while True:
+            idx = max(buf.rfind(sep, 0, idx) for sep in seps)
+            if idx < 0:
+                break
+            found = pos + idx
+            count += 1
+            if count == n:
+                return found
+        carry = buf[: max(map(len, seps)) - 1]
+    return found
 
 
 def show_interactions(session_id, last_n=None):
@@ -230,19 +353,17 @@ def show_interactions(session_id, last_n=None):
         print("No interaction log found.")
         return
         
-    with open(interaction_file) as f:
-        content = f.read()
-        
-    if last_n:
-        # Split by timestamp sections and get last N
-        sections = content.split('\n[')[1:]  # Skip first empty split
-        if sections:
-            sections = sections[-last_n:]
-            content = '\n[' + '\n['.join(sections)
-        
     print(f"\nInteractions from session {display}:")
     print("-" * 50)
-    print(content)
+    with open(interaction_file, "rb") as f:
+        # Sections start with "\n[<timestamp>"; only read the last N of them.
+        # The log holds raw PTY output, and reading it as text turns a lone
+        # "\r" into "\n" as well, so "\r[" starts a section too.
+        offset = _tail_offset(f, (b"\n[", b"\r["), last_n) if last_n else 0
+        f.seek(offset)
+        text = io.TextIOWrapper(f, encoding="utf-8", errors="replace", newline=None)
+        shutil.copyfileobj(text, sys.stdout)
+    print()
 
 
 def tail_transcript(session_id, follow=False):
@@ -257,65 +378,123 @@ def tail_transcript(session_id, follow=False):
         print("No transcript log found.")
         return
         
-    # Use system tail command for simplicity
-    import subprocess
-    cmd = ["tail"]
-    if follow:
-        cmd.append("-f")
-    else:
-        cmd.extend(["-n", "50"])
-    cmd.append(str(transcript_file))
-    
     try:
-        subprocess.run(cmd)
+        if follow:
+            _follow_file(transcript_file)
+        else:
+            with open(transcript_file, "rb") as f:
+                f.seek(_tail_lines_offset(f, 50))
+                sys.stdout.buffer.write(f.read())
+            sys.stdout.buffer.flush()
     except KeyboardInterrupt:
         pass
 
 
+def _tail_lines_offset(f, n: int, chunk_size: int = 64 * 1024) -> int:
+    """Return the offset where the last *n* lines of binary file *f* start."""
+    end = f.seek(0, os.SEEK_END)
+    if end == 0 or n <= 0:
+        return end
+    # A trailing newline terminates the last line rather than starting a new one.
+    f.seek(end - 1)
+    pos = end - 1 if f.read(1) == b"\n" else end
+    remaining = n
+    while pos > 0:
+        step = min(chunk_size, pos)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step)
+        idx = len(buf)
+        while True:
+            idx = buf.rfind(b"\n", 0, idx)
+            if idx < 0:
+                break
+            remaining -= 1
+            if remaining == 0:
+                return pos + idx + 1
+    return 0
+
+
+def _follow_file(path: Path, initial_lines: int = 10, interval: float = 0.25):
+    """Print the last lines of *path*, then keep printing what gets appended.
+
+    Like ``tail -F``: a truncated file is re-read from the start and a
+    replaced file (new inode) is re-opened.
+    """
+    out = sys.stdout.buffer
+    f = open(path, "rb")
+    try:
+        f.seek(_tail_lines_offset(f, initial_lines))
+        while True:
+            data = f.read()
+            if data:
+                out.write(data)
+                out.flush()
+                continue
+            time.sleep(interval)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if st.st_ino != os.fstat(f.fileno()).st_ino:
+                f.close()
+                f = open(path, "rb")
+            elif st.st_size < f.tell():
+                f.seek(0)
+    finally:
+        f.close()
+
+
 def cleanup_stale_sessions():
     """Remove symlinks for dead sessions."""
-    piloty_dir = get_piloty_dir()
-    active_dir = piloty_dir / "active"
+    active_dir = os.path.join(_PILOTY_DIR, "active")
     
-    if not active_dir.exists():
+    if not os.path.isdir(active_dir):
         print("No active directory found.")
         return
         
     removed = 0
-    for server_dir in active_dir.iterdir():
-        if not server_dir.is_dir():
+    live_pids = _live_pids()
+    for server_entry in _scandir_sorted(active_dir):
+        if not server_entry.is_dir(follow_symlinks=False):
             continue
-        for symlink in server_dir.iterdir():
-            if not symlink.is_symlink():
+        for link in _scandir_sorted(server_entry.path):
+            if not link.is_symlink():
                 continue
-            target = symlink.resolve()
+            target = os.path.realpath(link.path)
             
             # Check if session metadata exists
-            session_file = target / "session.json"
-            if session_file.exists():
-                with open(session_file) as f:
-                    metadata = json.load(f)
-                    
-                pid = metadata['pid']
+            session_file = os.path.join(target, "session.json")
+            if os.path.exists(session_file):
+                pid = _read_pid(session_file)
                 
                 # Check if process is running
-                try:
-                    os.kill(pid, 0)
-                except ProcessLookupError:
+                if not _pid_is_alive(pid, live_pids):
                     # Process is dead, remove symlink
-                    print(f"Removing stale session: {server_dir.name}/{symlink.name} (PID {pid} not found)")
-                    symlink.unlink()
+                    print(f"Removing stale session: {server_entry.name}/{link.name} (PID {pid} not found)")
+                    os.unlink(link.path)
                     removed += 1
             else:
                 # No metadata, remove symlink
-                print(f"Removing invalid session: {server_dir.name}/{symlink.name} (no metadata)")
-                symlink.unlink()
+                print(f"Removing invalid session: {server_entry.name}/{link.name} (no metadata)")
+                os.unlink(link.path)
                 removed += 1
                 
     print(f"\nRemoved {removed} stale session(s).")
 
 
-def main():
+def _build_parser():
+    import argparse
+
+    def count(value):
+        try:
+            n = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+        if n < 0:
+            raise argparse.ArgumentTypeError(f"must be non-negative: {value!r}")
+        return n
+
     parser = argparse.ArgumentParser(description="Inspect PiloTY session logs")
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -330,12 +509,12 @@ def main():
     # Commands command
     commands_parser = subparsers.add_parser('commands', help='Show commands from session')
     commands_parser.add_argument('session_id', help='Session ID')
-    commands_parser.add_argument('-n', '--last', type=int, help='Show only last N commands')
+    commands_parser.add_argument('-n', '--last', type=count, help='Show only last N commands')
     
     # Interactions command
     interactions_parser = subparsers.add_parser('interactions', help='Show formatted command/output interactions')
     interactions_parser.add_argument('session_id', help='Session ID')
-    interactions_parser.add_argument('-n', '--last', type=int, help='Show only last N interactions')
+    interactions_parser.add_argument('-n', '--last', type=count, help='Show only last N interactions')
     
     # Tail command
     tail_parser = subparsers.add_parser('tail', help='Tail transcript log')
@@ -344,13 +523,65 @@ def main():
     
     # Cleanup command
     cleanup_parser = subparsers.add_parser('cleanup', help='Remove stale session symlinks')
-    
-    args = parser.parse_args()
-    
-    if not args.command:
-        parser.print_help()
-        return
-        
+
+    return parser
+
+
+# command -> (getopt short options, long options, takes session_id); must
+# mirror _build_parser.
+_FAST_COMMANDS = {
+    'list': ('a', ['all'], False),
+    'info': ('', [], True),
+    'commands': ('n:', ['last='], True),
+    'interactions': ('n:', ['last='], True),
+    'tail': ('f', ['follow'], True),
+    'cleanup': ('', [], False),
+}
+
+
+def _parse_fast(argv):
+    """Parse well-formed invocations without building the argparse tree.
+
+    Returns None for anything unusual (help, bad options, wrong arity) so the
+    caller can let argparse handle it and produce its usual messages.
+    """
+    if not argv or argv[0] not in _FAST_COMMANDS:
+        return None
+    shortopts, longopts, takes_session = _FAST_COMMANDS[argv[0]]
+    try:
+        opts, rest = getopt.gnu_getopt(argv[1:], shortopts, longopts)
+    except getopt.GetoptError:
+        return None
+    if len(rest) != int(takes_session):
+        return None
+
+    args = SimpleNamespace(command=argv[0], all=False, last=None, follow=False)
+    if takes_session:
+        args.session_id = rest[0]
+    for opt, value in opts:
+        if opt in ('-a', '--all'):
+            args.all = True
+        elif opt in ('-f', '--follow'):
+            args.follow = True
+        elif opt in ('-n', '--last'):
+            try:
+                args.last = int(value)
+            except ValueError:
+                return None
+            if args.last < 0:
+                return None
+    return args
+
+
+def main():
+    args = _parse_fast(sys.argv[1:])
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+        if not args.command:
+            parser.print_help()
+            return
+
     if args.command == 'list':
         list_sessions(show_all=args.all)
     elif args.command == 'info':